@@ -18,19 +18,42 @@ References:
         IdentifierId, Identifier, CarrierId, CarrierFullName
 """
 
-import json
+import eventlet
+
+# Must run before any other import touches socket, threading or time
+eventlet.monkey_patch()
+
+import functools
+import itertools
 import logging
+import operator
 import os
-from datetime import datetime, timedelta
-from typing import Optional
-
+import re
+import sqlite3
+import threading
+from collections import deque
+from contextlib import closing
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Callable, Optional
+
+import orjson
 import pyodbc
+import sqlalchemy.event
+import sqlalchemy.exc
+import sqlalchemy.pool
+from cachetools import TTLCache
 from dotenv import load_dotenv
-from flask import Flask, jsonify, render_template, request
-from flask_socketio import SocketIO, emit
+from eventlet import tpool
+from flask import Flask, Response, jsonify, render_template, request
+from flask_compress import Compress
+from flask_socketio import SocketIO, emit, join_room, leave_room, rooms
 from zeep import Client as SoapClient
+from zeep import Settings as SoapSettings
+from zeep.cache import SqliteCache
 from zeep.transports import Transport
 from requests import Session as RequestsSession
+from requests.adapters import HTTPAdapter, Retry
 
 load_dotenv()
 
@@ -43,16 +66,23 @@ AEOS_WSDL_URL = os.getenv("AEOS_WSDL_URL", "https://localhost:8443/aeosws?wsdl")
 AEOS_WS_USER = os.getenv("AEOS_WS_USER", "")
 AEOS_WS_PASSWORD = os.getenv("AEOS_WS_PASSWORD", "")
 AEOS_WS_VERIFY_SSL = os.getenv("AEOS_WS_VERIFY_SSL", "false").lower() in ("true", "1")
+# Unset means zeep's per-user cache dir; a shared temp dir would let other
+# local users swap the cached soap:address
+AEOS_WSDL_CACHE_PATH = os.getenv("AEOS_WSDL_CACHE_PATH") or None
 
 # SQL Server (for analytics views)
 DB_DRIVER = os.getenv("DB_DRIVER", "{ODBC Driver 17 for SQL Server}")
 DB_SERVER = os.getenv("DB_SERVER", "localhost")
+# Readable secondary for analytics (defaults to the primary)
+DB_SERVER_RO = os.getenv("DB_SERVER_RO", DB_SERVER)
 DB_NAME = os.getenv("DB_NAME", "aeosdb")
 DB_USER = os.getenv("DB_USER", "")
 DB_PASSWORD = os.getenv("DB_PASSWORD", "")
 DB_TRUSTED = os.getenv("DB_TRUSTED_CONNECTION", "no").lower() in ("yes", "true", "1")
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "8"))
 
 POLL_INTERVAL = int(os.getenv("POLL_INTERVAL_SECONDS", "5"))
+ACCESS_POINT_CACHE_TTL = int(os.getenv("ACCESS_POINT_CACHE_SECONDS", "300"))
 SECRET_KEY = os.getenv("SECRET_KEY", "change-me-in-production")
 
 logging.basicConfig(
@@ -61,22 +91,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger("aeos-dashboard")
 
+
+def utcnow() -> datetime:
+    """Current time as a timezone-aware UTC datetime."""
+    return datetime.now(timezone.utc)
+
+
+def sql_hours_ago(hours: int) -> datetime:
+    """Naive UTC datetime ``hours`` ago, for SQL Server datetime parameters."""
+    return (utcnow() - timedelta(hours=hours)).replace(tzinfo=None)
+
+
+@functools.lru_cache(maxsize=64)
+def parse_day(date_str: str) -> date:
+    """Parse a ``YYYY-MM-DD`` query argument (most callers ask for today)."""
+    return datetime.strptime(date_str, "%Y-%m-%d").date()
+
+
 # ---------------------------------------------------------------------------
 # Flask + SocketIO
 # ---------------------------------------------------------------------------
 
 app = Flask(__name__)
 app.config["SECRET_KEY"] = SECRET_KEY
-socketio = SocketIO(app, cors_allowed_origins="*", async_mode="threading")
+# zstd / br / gzip negotiated from Accept-Encoding for the REST responses
+compress = Compress(app)
+# WebSocket frames use permessage-deflate when the browser offers it;
+# long-polling responses above the threshold are compressed by Engine.IO.
+socketio = SocketIO(
+    app,
+    cors_allowed_origins="*",
+    async_mode="eventlet",
+    ping_interval=25,
+    ping_timeout=20,
+    compression_threshold=512,
+)
 
 
 # ---------------------------------------------------------------------------
 # AEOS SOAP Client
 # ---------------------------------------------------------------------------
 
+SOAP_TIMEOUT = 15
+
 _soap_client: Optional[SoapClient] = None
 
 
+def _mount_adapter(session: RequestsSession, max_retries) -> None:
+    """Mount a pooled HTTP adapter on ``session`` for both schemes."""
+    # Keep connections to aeosws open between polls instead of paying a
+    # TLS handshake every few seconds
+    adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16, max_retries=max_retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
 def get_soap_client() -> SoapClient:
     """
     Create or return a cached Zeep SOAP client for AEOS web services.
@@ -88,23 +157,119 @@ def get_soap_client() -> SoapClient:
     if _soap_client is None:
         session = RequestsSession()
         session.verify = AEOS_WS_VERIFY_SSL
+        # No retries while fetching the WSDL: when AEOS is down, every
+        # get_soap_client() call (health check included) fails after a
+        # single connect timeout
+        _mount_adapter(session, max_retries=0)
+        session.headers["Accept-Encoding"] = "gzip, deflate"
+        session.headers["Connection"] = "keep-alive"
         if AEOS_WS_USER:
             session.auth = (AEOS_WS_USER, AEOS_WS_PASSWORD)
-        transport = Transport(session=session, timeout=15, operation_timeout=15)
-        _soap_client = SoapClient(wsdl=AEOS_WSDL_URL, transport=transport)
+        # Parsing the AEOS WSDL/XSD tree takes seconds; keep the downloaded
+        # documents on disk for a day so restarts skip the round-trips.
+        try:
+            cache = SqliteCache(path=AEOS_WSDL_CACHE_PATH, timeout=86400)
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("WSDL cache unavailable, fetching uncached: %s", exc)
+            cache = None
+        transport = Transport(
+            session=session, cache=cache,
+            timeout=SOAP_TIMEOUT, operation_timeout=SOAP_TIMEOUT,
+        )
+        _soap_client = SoapClient(
+            wsdl=AEOS_WSDL_URL,
+            transport=transport,
+            settings=SoapSettings(strict=False),
+        )
+        _mount_adapter(session, max_retries=Retry(total=1, connect=1, read=0, status=0))
         logger.info("AEOS SOAP client initialized: %s", AEOS_WSDL_URL)
     return _soap_client
 
 
+def _init_soap() -> None:
+    """Build the SOAP client at startup so the first request does not pay for it."""
+    try:
+        get_soap_client()
+    except Exception as exc:
+        # Not fatal: get_soap_client() retries lazily on the next request
+        logger.warning("AEOS SOAP client not available at startup: %s", exc)
+
+
+# EventInfo fields in WSDL order
+EVENT_FIELDS = (
+    "Id", "EventTypeId", "EventTypeName", "DateTime", "HostName",
+    "AccesspointId", "AccesspointName", "EntranceId", "EntranceName",
+    "IdentifierId", "Identifier", "CarrierId", "CarrierFullName",
+)
+
+# Fields pushed to the live feed by the WebSocket poll loop
+_EVT_ATTRS = (
+    "Id", "EventTypeName", "DateTime", "AccesspointId", "AccesspointName",
+    "CarrierFullName", "Identifier",
+)
+
+def _fields_getter(fields: tuple) -> Callable:
+    """
+    Return a function yielding a tuple of ``fields`` from a SOAP object.
+
+    Fields this AEOS version does not expose come back as None, like the
+    getattr defaults they replace.
+    """
+    getter = operator.attrgetter(*fields)
+    if len(fields) == 1:
+        single = getter
+        getter = lambda obj: (single(obj),)  # noqa: E731
+
+    def get(obj) -> tuple:
+        try:
+            return getter(obj)
+        except AttributeError:
+            return tuple(getattr(obj, name, None) for name in fields)
+
+    return get
+
+
+_event_getters: dict[tuple, Callable] = {}
+
+
+def _event_getter(fields: tuple) -> Callable:
+    """Return a memoized ``_fields_getter`` for EventInfo ``fields``."""
+    getter = _event_getters.get(fields)
+    if getter is None:
+        getter = _event_getters[fields] = _fields_getter(fields)
+    return getter
+
+
+def parse_event_fields(value: Optional[str]) -> tuple:
+    """
+    Parse a comma-separated ``?fields=`` value into a tuple of EventInfo fields.
+
+    Fields are returned in WSDL order so equivalent requests share a getter.
+    Raises ValueError on unknown field names or when no field is given.
+    """
+    if value is None or value == "":
+        return EVENT_FIELDS
+    requested = {name.strip() for name in value.split(",") if name.strip()}
+    if not requested:
+        raise ValueError("No event fields requested")
+    unknown = requested.difference(EVENT_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown event fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in EVENT_FIELDS if name in requested)
+
+
 def soap_find_events(from_dt: datetime, to_dt: datetime = None,
-                     max_results: int = 50) -> list[dict]:
+                     max_results: int = 50, offset: int = 0,
+                     fields: tuple = EVENT_FIELDS) -> list[dict]:
     """
     Call AEOS findEvent SOAP operation.
 
-    Returns EventInfo objects as dicts with fields matching the WSDL:
+    Returns EventInfo objects as dicts holding only ``fields`` (all WSDL
+    fields by default):
         Id, EventTypeId, EventTypeName, DateTime, HostName,
         AccesspointId, AccesspointName, EntranceId, EntranceName,
         IdentifierId, Identifier, CarrierId, CarrierFullName
+    plus the ``_status`` classification when EventTypeName is requested.
     """
     client = get_soap_client()
     try:
@@ -112,79 +277,95 @@ def soap_find_events(from_dt: datetime, to_dt: datetime = None,
             "EventSearchInfo": {
                 "DateTimeRange": {
                     "From": from_dt,
-                    "To": to_dt or datetime.utcnow(),
+                    "To": to_dt or utcnow(),
                 },
             },
             "SearchRange": {
-                "StartRecord": 0,
+                "StartRecord": offset,
                 "NrOfRecords": max_results,
             },
         }
         result = client.service.findEvent(**search)
-
-        events = []
-        if result:
-            for evt in result:
-                events.append({
-                    "Id": getattr(evt, "Id", None),
-                    "EventTypeId": getattr(evt, "EventTypeId", None),
-                    "EventTypeName": getattr(evt, "EventTypeName", ""),
-                    "DateTime": getattr(evt, "DateTime", None),
-                    "HostName": getattr(evt, "HostName", ""),
-                    "AccesspointId": getattr(evt, "AccesspointId", None),
-                    "AccesspointName": getattr(evt, "AccesspointName", ""),
-                    "EntranceId": getattr(evt, "EntranceId", None),
-                    "EntranceName": getattr(evt, "EntranceName", ""),
-                    "IdentifierId": getattr(evt, "IdentifierId", None),
-                    "Identifier": getattr(evt, "Identifier", ""),
-                    "CarrierId": getattr(evt, "CarrierId", None),
-                    "CarrierFullName": getattr(evt, "CarrierFullName", ""),
-                })
-        return events
+        if not result:
+            return []
+
+        getter = _event_getter(fields)
+        if "EventTypeName" not in fields:
+            return [dict(zip(fields, getter(evt))) for evt in result]
+        # Classify while projecting so callers never loop over events again
+        return [
+            dict(
+                zip(fields, getter(evt)),
+                _status=classify_event(getattr(evt, "EventTypeName", None)),
+            )
+            for evt in result
+        ]
     except Exception as exc:
         logger.error("SOAP findEvent failed: %s", exc)
         return []
 
 
+ACCESS_POINT_FIELDS = ("Id", "Name", "HostName", "Type", "Description", "EntranceId")
+_access_point_getter = _fields_getter(ACCESS_POINT_FIELDS)
+
+# The access point catalog changes on the order of days
+_ap_cache: TTLCache = TTLCache(maxsize=1, ttl=ACCESS_POINT_CACHE_TTL)
+_ap_cache_lock = threading.Lock()
+
+
 def soap_find_access_points() -> list[dict]:
     """
     Call AEOS findAccessPoint SOAP operation.
 
     Returns AccessPointInfo objects with fields:
         Id, Name, HostName, Type, Description, EntranceId
+
+    Results are cached for ACCESS_POINT_CACHE_TTL seconds; SOAP errors
+    are logged and re-raised so nothing empty gets cached.
     """
+    with _ap_cache_lock:
+        points = _ap_cache.get("points")
+    if points is not None:
+        return points
+
     client = get_soap_client()
     try:
         result = client.service.findAccessPoint(
             AccessPointSearchInfo={"Name": "*"}
         )
-        points = []
-        if result:
-            for ap in result:
-                points.append({
-                    "Id": getattr(ap, "Id", None),
-                    "Name": getattr(ap, "Name", ""),
-                    "HostName": getattr(ap, "HostName", ""),
-                    "Type": getattr(ap, "Type", ""),
-                    "Description": getattr(ap, "Description", ""),
-                    "EntranceId": getattr(ap, "EntranceId", None),
-                })
-        return points
+        points = [
+            dict(zip(ACCESS_POINT_FIELDS, _access_point_getter(ap)))
+            for ap in result or ()
+        ]
     except Exception as exc:
         logger.error("SOAP findAccessPoint failed: %s", exc)
-        return []
+        raise
+
+    with _ap_cache_lock:
+        _ap_cache["points"] = points
+    return points
+
+
+def clear_access_point_cache() -> None:
+    """Forget the cached access point catalog."""
+    with _ap_cache_lock:
+        _ap_cache.clear()
 
 
 # ---------------------------------------------------------------------------
 # Database helpers (for SQL analytics views)
 # ---------------------------------------------------------------------------
 
-def get_connection() -> pyodbc.Connection:
-    """Create a new SQL Server connection for analytics queries."""
+# Must be set before the first connection is opened
+pyodbc.pooling = True
+
+
+def _connection_string(server: str, read_only: bool = False) -> str:
+    """Build the ODBC connection string for ``server``."""
     if DB_TRUSTED:
         conn_str = (
             f"DRIVER={DB_DRIVER};"
-            f"SERVER={DB_SERVER};"
+            f"SERVER={server};"
             f"DATABASE={DB_NAME};"
             f"Trusted_Connection=yes;"
             f"TrustServerCertificate=yes;"
@@ -192,31 +373,185 @@ def get_connection() -> pyodbc.Connection:
     else:
         conn_str = (
             f"DRIVER={DB_DRIVER};"
-            f"SERVER={DB_SERVER};"
+            f"SERVER={server};"
             f"DATABASE={DB_NAME};"
             f"UID={DB_USER};"
             f"PWD={DB_PASSWORD};"
             f"TrustServerCertificate=yes;"
         )
-    return pyodbc.connect(conn_str, timeout=10)
+    if read_only:
+        # Routed to a readable secondary when DB_SERVER_RO is an AG listener
+        conn_str += "ApplicationIntent=ReadOnly;MultiSubnetFailover=yes;"
+    return conn_str
+
 
+def _make_raw_connection() -> pyodbc.Connection:
+    """Open a new SQL Server connection (used by the primary pool)."""
+    return tpool.execute(pyodbc.connect, _connection_string(DB_SERVER), timeout=10)
 
-def query_rows(sql: str, params: tuple = ()) -> list[dict]:
+
+def _make_raw_connection_ro() -> pyodbc.Connection:
+    """Open a new read-only connection (used by the analytics pool)."""
+    conn_str = _connection_string(DB_SERVER_RO, read_only=True)
+    return tpool.execute(pyodbc.connect, conn_str, timeout=10)
+
+
+def _select_one(conn) -> None:
+    """Round-trip a trivial query on ``conn`` (blocking; run it through tpool)."""
+    conn.cursor().execute("SELECT 1").fetchall()
+
+
+def _ping_connection(dbapi_connection, connection_record, connection_proxy):
+    """Check a pooled connection is still alive before handing it out."""
+    try:
+        tpool.execute(_select_one, dbapi_connection)
+    except pyodbc.Error as exc:
+        # The pool discards this connection and retries with a fresh one
+        raise sqlalchemy.exc.DisconnectionError() from exc
+
+
+def _reset_connection(dbapi_connection, connection_record, reset_state):
+    """Roll back a returned connection off the eventlet hub."""
+    if not reset_state.terminate_only:
+        tpool.execute(dbapi_connection.rollback)
+
+
+def _make_pool(creator: Callable) -> sqlalchemy.pool.QueuePool:
+    """Create a connection pool that validates connections on checkout."""
+    # Connections are recycled after 30 minutes: long-lived handles leak
+    # memory in some unixODBC / msodbcsql combinations.
+    cnx_pool = sqlalchemy.pool.QueuePool(
+        creator,
+        pool_size=DB_POOL_SIZE,
+        max_overflow=DB_POOL_SIZE,
+        timeout=10,
+        recycle=1800,
+        # The rollback on return is done by _reset_connection through tpool
+        reset_on_return=None,
+    )
+    sqlalchemy.event.listen(cnx_pool, "checkout", _ping_connection)
+    sqlalchemy.event.listen(cnx_pool, "reset", _reset_connection)
+    return cnx_pool
+
+
+# Separate pools: a slow analytics scan can exhaust its own pool without
+# starving the health check and other latency-sensitive callers.
+_cnx_pool = _make_pool(_make_raw_connection)
+_cnx_pool_ro = _make_pool(_make_raw_connection_ro)
+
+
+def get_connection() -> pyodbc.Connection:
+    """
+    Check out a SQL Server connection from the pool.
+
+    The returned proxy behaves like a pyodbc connection; ``close()``
+    hands it back to the pool instead of closing the socket.
+    """
+    return _cnx_pool.connect()
+
+
+def get_connection_ro() -> pyodbc.Connection:
+    """Check out a read-only connection for analytics (see get_connection)."""
+    return _cnx_pool_ro.connect()
+
+
+FETCH_BATCH_SIZE = 1000
+
+
+# String literals ('' escapes), [bracketed] identifiers and comments may
+# contain a literal "?" that is not a parameter marker.
+_NON_MARKER_RE = re.compile(r"'(?:[^']|'')*'|\[[^\]]*\]|--[^\n]*|/\*.*?\*/", re.S)
+
+
+@functools.lru_cache(maxsize=64)
+def _count_markers(sql: str) -> int:
+    """Number of ODBC ``?`` parameter markers in ``sql``."""
+    return _NON_MARKER_RE.sub("", sql).count("?")
+
+
+def _execute(conn, sql: str, params: tuple):
+    """Execute ``sql`` and return ``(columns, row_batches)`` for the cursor."""
+    # A marker/parameter mismatch would otherwise surface as an opaque
+    # driver error (or run with an unbound placeholder)
+    if _count_markers(sql) != len(params):
+        raise ValueError(
+            f"SQL expects {_count_markers(sql)} parameters, got {len(params)}"
+        )
+    cursor = conn.cursor()
+    cursor.arraysize = FETCH_BATCH_SIZE
+    param_types = PARAM_TYPES.get(sql)
+    if param_types:
+        cursor.setinputsizes(list(param_types))
+    # pyodbc blocks inside the driver without yielding to the eventlet hub,
+    # so the round-trips run on eventlet's native thread pool.
+    tpool.execute(cursor.execute, sql, params)
+    columns = tuple(col[0] for col in cursor.description)
+    return columns, iter(lambda: tpool.execute(cursor.fetchmany, FETCH_BATCH_SIZE), [])
+
+
+def query_rows(sql: str, params: tuple = (), readonly: bool = False) -> list[dict]:
     """Execute a SELECT and return rows as a list of dicts."""
-    with get_connection() as conn:
-        cursor = conn.cursor()
-        cursor.execute(sql, params)
-        columns = [col[0] for col in cursor.description]
-        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+    with closing(get_connection_ro() if readonly else get_connection()) as conn:
+        columns, batches = _execute(conn, sql, params)
+        return [dict(zip(columns, row)) for batch in batches for row in batch]
+
+
+def query_columnar(sql: str, params: tuple = (),
+                   readonly: bool = False) -> dict[str, list]:
+    """Execute a SELECT and return ``{column: [values...]}`` (one list per column)."""
+    with closing(get_connection_ro() if readonly else get_connection()) as conn:
+        columns, batches = _execute(conn, sql, params)
+        data = {col: [] for col in columns}
+        lists = tuple(data.values())
+        for batch in batches:
+            for row in batch:
+                for values, value in zip(lists, row):
+                    values.append(value)
+        return data
+
+
+def query_analytics(sql: str, params: tuple = ()):
+    """
+    Run an analytics query in the layout asked for by ``?layout=``.
+
+    ``rows`` (default) returns a list of dicts; ``columns`` returns one list
+    per column, which is smaller on the wire since keys appear only once.
+    Analytics always run on the read-only pool.
+    """
+    if request.args.get("layout") == "columns":
+        return query_columnar(sql, params, readonly=True)
+    return query_rows(sql, params, readonly=True)
 
 
 def serialize(obj):
-    """JSON serializer for datetime objects."""
-    if isinstance(obj, datetime):
-        return obj.isoformat()
+    """orjson fallback for types it does not encode natively (SQL DECIMAL)."""
+    if isinstance(obj, Decimal):
+        return float(obj)
     raise TypeError(f"Type {type(obj)} not serializable")
 
 
+def dumps(obj) -> bytes:
+    """
+    Encode to JSON bytes with orjson.
+
+    datetimes are encoded natively; naive ones are tagged as UTC since the
+    dashboard works in UTC throughout.
+    """
+    return orjson.dumps(obj, default=serialize, option=orjson.OPT_NAIVE_UTC)
+
+
+def to_columns(rows: list[dict]) -> dict[str, list]:
+    """Pivot same-keyed dicts into ``{key: [values...]}`` so keys are sent once."""
+    if not rows:
+        return {}
+    return {key: [row[key] for row in rows] for key in rows[0]}
+
+
+def json_response(obj) -> Response:
+    """Return ``obj`` as an application/json response in a single encode."""
+    return Response(dumps(obj), mimetype="application/json")
+
+
 # ---------------------------------------------------------------------------
 # AEOS Event type classification
 # ---------------------------------------------------------------------------
@@ -246,16 +581,22 @@ ALARM_TYPES = {
 }
 
 
+# Granted/denied match on prefix (covers every variant above), alarms match
+# the whole name. One C-level match replaces strip/lower/startswith per event.
+_CLASSIFY_RE = re.compile(
+    r"\s*(?:(access granted)|(access denied)|((?:%s)\s*\Z))"
+    % "|".join(re.escape(name) for name in sorted(ALARM_TYPES)),
+    re.IGNORECASE,
+)
+_CLASSIFY_GROUPS = (None, "granted", "denied", "alarm")
+
+
 def classify_event(event_type_name: str) -> str:
     """Classify an AEOS EventTypeName into a category."""
-    name = event_type_name.strip()
-    if name in GRANTED_TYPES or name.lower().startswith("access granted"):
-        return "granted"
-    if name in DENIED_TYPES or name.lower().startswith("access denied"):
-        return "denied"
-    if name in ALARM_TYPES:
-        return "alarm"
-    return "other"
+    match = _CLASSIFY_RE.match(event_type_name or "")
+    if match is None:
+        return "other"
+    return _CLASSIFY_GROUPS[match.lastindex]
 
 
 # ---------------------------------------------------------------------------
@@ -283,35 +624,47 @@ def classify_event(event_type_name: str) -> str:
 #   JOIN ...
 #
 # Column names follow the AEOS WSDL EventInfo schema exactly.
+#
+# Every query filters on a [DateTime] window: the underlying event table
+# needs the covering index IX_AeosEvent_DateTime_Covering (see README) or
+# each call scans the whole table regardless of the window size.
+#
+# Hourly traffic and top access points are read from pre-aggregated rollup
+# tables instead of scanning the view on every request:
+#
+#   dbo.mv_HourlyEventStats        (Date, Hour)                  PK
+#   dbo.mv_AccessPointHourlyStats  (HourStart, AccesspointName)  PK
+#
+# Both are maintained by dbo.usp_RefreshEventRollups, which re-aggregates
+# only the hours at or after its LastRefreshedAt watermark. Schedule it with
+# a SQL Agent job (e.g. every minute). DDL is in the README.
 # ---------------------------------------------------------------------------
 
 SQL_HOURLY_TRAFFIC = """
 SELECT
-    DATEPART(HOUR, ev.[DateTime]) AS [Hour],
-    COUNT(*) AS EventCount,
-    SUM(CASE WHEN ev.EventTypeName LIKE 'Access granted%' THEN 1 ELSE 0 END) AS Granted,
-    SUM(CASE WHEN ev.EventTypeName LIKE 'Access denied%' THEN 1 ELSE 0 END) AS Denied
-FROM dbo.vw_AeosEventLog ev WITH (NOLOCK)
-WHERE ev.[DateTime] >= @since
-  AND ev.[DateTime] < @until
-GROUP BY DATEPART(HOUR, ev.[DateTime])
-ORDER BY [Hour];
+    hs.[Hour],
+    hs.EventCount,
+    hs.Granted,
+    hs.Denied
+FROM dbo.mv_HourlyEventStats hs
+WHERE hs.[Date] = ?
+ORDER BY hs.[Hour];
 """
 
 SQL_TOP_ACCESS_POINTS = """
-SELECT TOP (@top)
-    ev.AccesspointName,
-    COUNT(*) AS EventCount,
-    SUM(CASE WHEN ev.EventTypeName LIKE 'Access granted%' THEN 1 ELSE 0 END) AS Granted,
-    SUM(CASE WHEN ev.EventTypeName LIKE 'Access denied%' THEN 1 ELSE 0 END) AS Denied
-FROM dbo.vw_AeosEventLog ev WITH (NOLOCK)
-WHERE ev.[DateTime] >= @since
-GROUP BY ev.AccesspointName
+SELECT TOP (?)
+    aps.AccesspointName,
+    SUM(aps.EventCount) AS EventCount,
+    SUM(aps.Granted) AS Granted,
+    SUM(aps.Denied) AS Denied
+FROM dbo.mv_AccessPointHourlyStats aps
+WHERE aps.HourStart >= ?
+GROUP BY aps.AccesspointName
 ORDER BY EventCount DESC;
 """
 
 SQL_SECURITY_ALERTS = """
-SELECT TOP (@top)
+SELECT TOP (?)
     ev.[DateTime],
     ev.EventTypeName,
     ev.AccesspointName,
@@ -324,9 +677,15 @@ SELECT TOP (@top)
         WHEN ev.EventTypeName = 'Door held open'    THEN 'Porte maintenue ouverte'
         WHEN ev.EventTypeName LIKE 'Access denied%' THEN 'Accès refusé — ' + ev.EventTypeName
         ELSE ev.EventTypeName
-    END AS AlertDescription
+    END AS AlertDescription,
+    CASE
+        WHEN ev.EventTypeName LIKE 'Access granted%' THEN 'granted'
+        WHEN ev.EventTypeName LIKE 'Access denied%'  THEN 'denied'
+        WHEN ev.EventTypeName IN ('Door forced open', 'Door held open', 'Tailgating') THEN 'alarm'
+        ELSE 'other'
+    END AS _status
 FROM dbo.vw_AeosEventLog ev WITH (NOLOCK)
-WHERE ev.[DateTime] >= @since
+WHERE ev.[DateTime] >= ?
   AND (
       ev.EventTypeName LIKE 'Access denied%'
       OR ev.EventTypeName IN ('Door forced open', 'Door held open', 'Tailgating')
@@ -334,6 +693,81 @@ WHERE ev.[DateTime] >= @since
 ORDER BY ev.[DateTime] DESC;
 """
 
+# Explicit parameter types per query. Binding every call with the same types
+# lets SQL Server reuse one cached plan per statement instead of compiling a
+# new one whenever pyodbc infers a different type/precision from the value.
+_SQL_INT = (pyodbc.SQL_INTEGER, 0, 0)
+_SQL_DATE = (pyodbc.SQL_TYPE_DATE, 10, 0)
+_SQL_DATETIME = (pyodbc.SQL_TYPE_TIMESTAMP, 23, 3)
+
+PARAM_TYPES = {
+    SQL_HOURLY_TRAFFIC: (_SQL_DATE,),
+    SQL_TOP_ACCESS_POINTS: (_SQL_INT, _SQL_DATETIME),
+    SQL_SECURITY_ALERTS: (_SQL_INT, _SQL_DATETIME),
+}
+
+
+# ---------------------------------------------------------------------------
+# Response cache — identical dashboard queries within a poll interval
+# ---------------------------------------------------------------------------
+
+_response_cache_lock = threading.Lock()
+
+
+def cached_endpoint(ttl: int = POLL_INTERVAL, maxsize: int = 256):
+    """
+    Cache 200 responses for ``ttl`` seconds, keyed on path and sorted query
+    arguments, with one compressed body per ``Accept-Encoding``. Adds
+    ``cache_clear()`` to the view.
+    """
+    def decorator(view):
+        cache = TTLCache(maxsize=maxsize, ttl=ttl)
+
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            key = (request.path, tuple(sorted(request.args.items(multi=True))))
+            accept_encoding = request.headers.get("Accept-Encoding", "")
+            with _response_cache_lock:
+                entry = cache.get(key)
+                encoded = entry[2].get(accept_encoding) if entry is not None else None
+            if encoded is not None:
+                logger.debug("cache %s %s", "HIT", key)
+                body, encoding = encoded
+                response = Response(body, content_type=entry[1])
+                if encoding:
+                    response.headers["Content-Encoding"] = encoding
+                response.headers["Vary"] = "Accept-Encoding"
+                return response
+
+            if entry is None:
+                logger.debug("cache %s %s", "MISS", key)
+                response = app.make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+                entry = (response.get_data(), response.content_type, {})
+                with _response_cache_lock:
+                    cache[key] = entry
+            else:
+                response = Response(entry[0], content_type=entry[1])
+
+            # Compressed once per Accept-Encoding; Content-Encoding makes Flask-Compress skip hits
+            response = compress.after_request(response)
+            with _response_cache_lock:
+                entry[2][accept_encoding] = (
+                    response.get_data(),
+                    response.headers.get("Content-Encoding"),
+                )
+            return response
+
+        def cache_clear():
+            with _response_cache_lock:
+                cache.clear()
+
+        wrapper.cache_clear = cache_clear
+        return wrapper
+
+    return decorator
+
 
 # ---------------------------------------------------------------------------
 # REST API endpoints
@@ -345,28 +779,35 @@ def index():
     return render_template("dashboard.html")
 
 
+def _ping_db(connect: Callable) -> str:
+    """Run ``SELECT 1`` on a connection from ``connect``; "ok" or the error."""
+    try:
+        with closing(connect()) as conn:
+            tpool.execute(_select_one, conn)
+    except Exception as exc:
+        return f"error: {exc}"
+    return "ok"
+
+
 @app.route("/api/health")
 def health():
-    """Health check — test both SOAP and SQL connections."""
+    """Health check — test SOAP, the primary and the analytics SQL connections."""
     soap_status = "ok"
-    db_status = "ok"
 
     try:
         get_soap_client()
     except Exception as exc:
         soap_status = f"error: {exc}"
 
-    try:
-        with get_connection() as conn:
-            conn.cursor().execute("SELECT 1")
-    except Exception as exc:
-        db_status = f"error: {exc}"
+    db_status = _ping_db(get_connection)
+    db_ro_status = _ping_db(get_connection_ro)
 
     return jsonify({
         "status": "ok",
         "aeos_soap": soap_status,
         "database": db_status,
-        "timestamp": datetime.utcnow().isoformat(),
+        "database_ro": db_ro_status,
+        "timestamp": utcnow().isoformat(),
     })
 
 
@@ -377,71 +818,101 @@ def api_recent_events():
 
     Events are returned with the full AEOS EventInfo structure:
     Id, EventTypeName, DateTime, AccesspointName, CarrierFullName, etc.
+    ``?fields=Id,DateTime,...`` restricts the returned columns and
+    ``?offset=`` pages through the result set.
     """
     limit = min(int(request.args.get("limit", 50)), 500)
+    offset = max(int(request.args.get("offset", 0)), 0)
     hours = int(request.args.get("hours", 1))
-    since = datetime.utcnow() - timedelta(hours=hours)
+    since = utcnow() - timedelta(hours=hours)
+    try:
+        fields = parse_event_fields(request.args.get("fields"))
+    except ValueError as exc:
+        return jsonify({"error": str(exc)}), 400
 
     try:
-        events = soap_find_events(from_dt=since, max_results=limit)
-        # Add classification for the UI
-        for evt in events:
-            evt["_status"] = classify_event(evt.get("EventTypeName", ""))
-        return jsonify({"events": json.loads(json.dumps(events, default=serialize))})
+        events = soap_find_events(
+            from_dt=since, max_results=limit, offset=offset, fields=fields
+        )
+        return json_response({"events": events})
     except Exception as exc:
         logger.error("Failed to fetch events: %s", exc)
         return jsonify({"error": str(exc)}), 500
 
 
 @app.route("/api/accesspoints")
+@cached_endpoint()
 def api_access_points():
     """Return all access points from AEOS via SOAP findAccessPoint."""
     try:
         points = soap_find_access_points()
-        return jsonify({"access_points": points})
+        return json_response({"access_points": points})
     except Exception as exc:
         logger.error("Failed to fetch access points: %s", exc)
         return jsonify({"error": str(exc)}), 500
 
 
+@app.route("/api/accesspoints/refresh", methods=["POST"])
+def api_refresh_access_points():
+    """Drop the cached access point catalog so the next read queries AEOS."""
+    clear_access_point_cache()
+    api_access_points.cache_clear()
+    logger.info("Access point cache cleared")
+    return jsonify({"status": "ok"})
+
+
+@app.route("/api/doors/status")
+def api_door_status():
+    """
+    Return the last known state of each access point.
+
+    Served from the in-memory snapshot maintained by the WebSocket poll
+    loop: only access points with an event since startup are listed.
+    """
+    return json_response({"doors": list(_door_status.values())})
+
+
 @app.route("/api/analytics/hourly")
+@cached_endpoint()
 def api_hourly_traffic():
-    """Return hourly traffic breakdown from SQL analytics view."""
-    date_str = request.args.get("date", datetime.utcnow().strftime("%Y-%m-%d"))
-    target = datetime.strptime(date_str, "%Y-%m-%d")
-    since = target.replace(hour=0, minute=0, second=0)
-    until = since + timedelta(days=1)
+    """Return hourly traffic breakdown from the mv_HourlyEventStats rollup."""
+    date_str = request.args.get("date")
+    target = parse_day(date_str) if date_str else utcnow().date()
+    date_str = target.isoformat()
     try:
-        rows = query_rows(SQL_HOURLY_TRAFFIC, (since, until))
-        return jsonify({"date": date_str, "hourly": rows})
+        rows = query_analytics(SQL_HOURLY_TRAFFIC, (target,))
+        return json_response({"date": date_str, "hourly": rows})
     except Exception as exc:
         logger.error("Failed to fetch hourly traffic: %s", exc)
         return jsonify({"error": str(exc)}), 500
 
 
 @app.route("/api/analytics/top-access-points")
+@cached_endpoint()
 def api_top_access_points():
-    """Return busiest access points from SQL analytics view."""
+    """Return busiest access points from the mv_AccessPointHourlyStats rollup."""
     top = min(int(request.args.get("limit", 10)), 50)
     hours = int(request.args.get("hours", 24))
-    since = datetime.utcnow() - timedelta(hours=hours)
+    # The rollup is bucketed per hour, so the window starts on an hour boundary
+    since = sql_hours_ago(hours).replace(minute=0, second=0, microsecond=0)
     try:
-        rows = query_rows(SQL_TOP_ACCESS_POINTS, (top, since))
-        return jsonify({"access_points": rows})
+        rows = query_analytics(SQL_TOP_ACCESS_POINTS, (top, since))
+        return json_response({"access_points": rows})
     except Exception as exc:
         logger.error("Failed to fetch top access points: %s", exc)
         return jsonify({"error": str(exc)}), 500
 
 
 @app.route("/api/alerts")
+@cached_endpoint()
 def api_security_alerts():
     """Return security alerts from SQL analytics view."""
     top = min(int(request.args.get("limit", 20)), 200)
     hours = int(request.args.get("hours", 24))
-    since = datetime.utcnow() - timedelta(hours=hours)
+    since = sql_hours_ago(hours)
     try:
-        rows = query_rows(SQL_SECURITY_ALERTS, (top, since))
-        return jsonify({"alerts": json.loads(json.dumps(rows, default=serialize))})
+        rows = query_analytics(SQL_SECURITY_ALERTS, (top, since))
+        return json_response({"alerts": rows})
     except Exception as exc:
         logger.error("Failed to fetch alerts: %s", exc)
         return jsonify({"error": str(exc)}), 500
@@ -451,37 +922,240 @@ def api_security_alerts():
 # WebSocket event push — polls AEOS SOAP findEvent
 # ---------------------------------------------------------------------------
 
+BROADCAST_BATCH_SIZE = 50
+# Clients receive events only for the access point rooms they subscribed to;
+# everyone starts in the wildcard room until they narrow their subscription.
+ALL_ACCESS_POINTS_ROOM = "ap:*"
+SEEN_EVENT_IDS_MAX = 1024
+# Each poll re-reads this much before the watermark: AEOS events sharing a
+# timestamp (batch inserts, tailgating pairs) are otherwise dropped or
+# duplicated depending on how the service compares DateTime bounds.
+POLL_OVERLAP = timedelta(seconds=1)
+POLL_PAGE_SIZE = 20
+# Upper bound on pages read per poll, in case AEOS keeps returning full pages
+POLL_MAX_PAGES = 50
+
 _last_event_time: Optional[datetime] = None
+_seen_event_ids: deque = deque(maxlen=SEEN_EVENT_IDS_MAX)
+_seen_event_id_set: set = set()
+
+RING_SIZE = 1000
+RECENT_EVENTS_ON_CONNECT = 50
+
+
+class EventRing:
+    """
+    Fixed-size, column-oriented buffer of the most recently pushed events.
+
+    Each field lives in its own list, so a tail slice is already in the
+    columnar payload shape sent over the WebSocket. Serialized tails are
+    cached until the next push: every (re)connecting client gets the same
+    bytes.
+    """
+
+    def __init__(self, size: int, fields: tuple):
+        self.size = size
+        self.fields = fields
+        self.columns = {name: [None] * size for name in fields}
+        self.count = 0
+        self._tails: dict[int, bytes] = {}
+
+    def push(self, events: list[dict]) -> None:
+        """Append events, overwriting the oldest once the ring is full."""
+        for evt in events:
+            pos = self.count % self.size
+            for name, column in self.columns.items():
+                column[pos] = evt.get(name)
+            self.count += 1
+        self._tails.clear()
+
+    def tail(self, k: int) -> bytes:
+        """Return the last ``k`` events, oldest first, as columnar JSON bytes."""
+        payload = self._tails.get(k)
+        if payload is None:
+            n = min(k, self.count, self.size)
+            start = (self.count - n) % self.size
+            end = start + n
+            if end <= self.size:
+                data = {name: col[start:end] for name, col in self.columns.items()}
+            else:
+                end -= self.size
+                data = {
+                    name: col[start:] + col[:end]
+                    for name, col in self.columns.items()
+                }
+            payload = self._tails[k] = dumps(data)
+        return payload
+
+
+_event_ring = EventRing(RING_SIZE, _EVT_ATTRS + ("_status",))
+
+# Last known state per access point, fed by the poll loop. Door state only
+# changes through events, so /api/doors/status never needs to hit AEOS.
+_door_status: dict[int, dict] = {}
+
+
+def _update_door_status(events: list[dict]) -> None:
+    """Record the latest event of each access point in the door snapshot."""
+    for evt in events:
+        ap_id = evt["AccesspointId"]
+        if ap_id is None:
+            continue
+        current = _door_status.get(ap_id)
+        last_time = current["LastEventTime"] if current else None
+        if last_time and evt["DateTime"] and evt["DateTime"] < last_time:
+            continue
+        _door_status[ap_id] = {
+            "AccesspointId": ap_id,
+            "AccesspointName": evt["AccesspointName"],
+            "LastEventTime": evt["DateTime"],
+            "LastEventTypeName": evt["EventTypeName"],
+            "Status": evt["_status"],
+        }
+
+
+def _filter_unseen(events: list[dict]) -> list[dict]:
+    """Drop events already pushed to clients (and duplicates within the batch)."""
+    fresh = []
+    batch_ids = set()
+    for evt in events:
+        event_id = evt["Id"]
+        if event_id is not None:
+            if event_id in _seen_event_id_set or event_id in batch_ids:
+                continue
+            batch_ids.add(event_id)
+        fresh.append(evt)
+    return fresh
+
+
+def _mark_seen(events: list[dict]) -> None:
+    """Remember the Ids of events that were pushed to clients."""
+    for evt in events:
+        event_id = evt["Id"]
+        if event_id is None:
+            continue
+        if len(_seen_event_ids) == _seen_event_ids.maxlen:
+            _seen_event_id_set.discard(_seen_event_ids[0])
+        _seen_event_ids.append(event_id)
+        _seen_event_id_set.add(event_id)
+
+
+def _fetch_since(from_dt: datetime) -> list[dict]:
+    """
+    Read every event since ``from_dt``, page by page.
+
+    The overlap window can hold more events than one page; stopping at the
+    first page would return the same already-seen rows on every poll.
+    """
+    events = []
+    for page in range(POLL_MAX_PAGES):
+        batch = soap_find_events(
+            from_dt=from_dt,
+            max_results=POLL_PAGE_SIZE,
+            offset=page * POLL_PAGE_SIZE,
+            fields=_EVT_ATTRS,
+        )
+        events.extend(batch)
+        if len(batch) < POLL_PAGE_SIZE:
+            break
+    else:
+        logger.warning("Event poll stopped after %d full pages", POLL_MAX_PAGES)
+    return events
+
+
+def access_point_room(ap_id: int) -> str:
+    """Socket.IO room receiving the events of one access point."""
+    return f"ap:{ap_id}"
+
+
+def room_sids(room: Optional[str], namespace: str = "/") -> list:
+    """Session ids in ``room`` (every connected client when ``room`` is None)."""
+    return [sid for sid, _ in socketio.server.manager.get_participants(namespace, room)]
+
+
+def broadcast_batched(event: str, payload: bytes, sids: list,
+                      batch: int = BROADCAST_BATCH_SIZE,
+                      namespace: str = "/") -> int:
+    """
+    Send an already-serialized JSON payload to the clients in ``sids``.
+
+    Clients are sent to in slices of ``batch``, one emit per slice: the
+    Socket.IO manager encodes the packet once per emit and loops over the
+    slice's sids itself. The scheduler is yielded between slices so a large
+    audience does not starve the request handlers.
+
+    Returns the number of clients the payload was sent to.
+    """
+    for start in range(0, len(sids), batch):
+        socketio.emit(event, payload, to=sids[start:start + batch], namespace=namespace)
+        socketio.sleep(0)
+    return len(sids)
+
+
+def push_events(events: list[dict]) -> int:
+    """
+    Fan new events out to the subscribed rooms.
+
+    Wildcard subscribers get the whole batch, each ``ap:<id>`` room only its
+    own events, and alarms are also sent to every client as ``new_alerts``.
+    Payloads are columnar (see to_columns) and only encoded for rooms that
+    have clients. Returns the number of ``new_events`` deliveries.
+    """
+    sent = 0
+    sids = room_sids(ALL_ACCESS_POINTS_ROOM)
+    if sids:
+        sent += broadcast_batched("new_events", dumps(to_columns(events)), sids)
+
+    def ap_key(evt):
+        return evt["AccesspointId"]
+
+    located = sorted((e for e in events if e["AccesspointId"] is not None), key=ap_key)
+    for ap_id, group in itertools.groupby(located, key=ap_key):
+        sids = room_sids(access_point_room(ap_id))
+        if sids:
+            sent += broadcast_batched("new_events", dumps(to_columns(list(group))), sids)
+
+    alarms = [e for e in events if e["_status"] == "alarm"]
+    if alarms:
+        sids = room_sids(None)
+        if sids:
+            broadcast_batched("new_alerts", dumps(to_columns(alarms)), sids)
+    return sent
 
 
 def poll_new_events():
     """Background task: poll AEOS findEvent SOAP and push via WebSocket."""
     global _last_event_time
-    _last_event_time = datetime.utcnow()
+    _last_event_time = utcnow()
 
     while True:
         socketio.sleep(POLL_INTERVAL)
         try:
-            events = soap_find_events(from_dt=_last_event_time, max_results=20)
+            fetched = _fetch_since(_last_event_time - POLL_OVERLAP)
+            events = _filter_unseen(fetched)
             if events:
-                for evt in events:
-                    evt["_status"] = classify_event(evt.get("EventTypeName", ""))
-
-                # Update watermark to latest event DateTime
-                latest = max(
-                    (e["DateTime"] for e in events if e.get("DateTime")),
-                    default=_last_event_time,
+                sent = push_events(events)
+                # Only after a successful push: a failed one is retried next poll
+                _mark_seen(events)
+                _update_door_status(events)
+                _event_ring.push(events)
+                # Logged for tracing only: deduplication relies on the seen
+                # Ids and the DateTime overlap, not on Id ordering
+                max_id = max((e["Id"] for e in events if e["Id"] is not None), default=None)
+                logger.debug(
+                    "Pushed %d new events (up to Id %s) to %d clients",
+                    len(events), max_id, sent,
                 )
-                if isinstance(latest, str):
-                    latest = datetime.fromisoformat(latest)
-                _last_event_time = latest
-
-                socketio.emit(
-                    "new_events",
-                    json.loads(json.dumps(events, default=serialize)),
-                    namespace="/",
-                )
-                logger.debug("Pushed %d new events via WebSocket", len(events))
+
+            # Update watermark to the latest DateTime of every fetched row,
+            # seen or not, so a window full of known events is left behind
+            latest = max(
+                (e["DateTime"] for e in fetched if e.get("DateTime")),
+                default=_last_event_time,
+            )
+            if isinstance(latest, str):
+                latest = datetime.fromisoformat(latest)
+            _last_event_time = latest
         except Exception as exc:
             logger.warning("Event poll failed: %s", exc)
 
@@ -490,7 +1164,57 @@ def poll_new_events():
 def handle_connect():
     """Handle new WebSocket connection."""
     logger.info("Client connected: %s", request.sid)
+    join_room(ALL_ACCESS_POINTS_ROOM)
     emit("status", {"message": "Connecté au Dashboard AEOS"})
+    # Catch-up for late joiners and reconnects, without a REST round-trip
+    emit("recent_events", _event_ring.tail(RECENT_EVENTS_ON_CONNECT))
+
+
+def parse_subscription(data) -> list[str]:
+    """
+    Turn a ``subscribe`` payload into the list of rooms to join.
+
+    Raises ValueError on anything but ``"*"`` or a list of integer Ids.
+    """
+    if data is None:
+        data = {}
+    if not isinstance(data, dict):
+        raise ValueError("subscribe expects an object")
+    ap_ids = data.get("ap_ids", "*")
+    if ap_ids == "*":
+        return [ALL_ACCESS_POINTS_ROOM]
+    if not isinstance(ap_ids, list):
+        raise ValueError('ap_ids must be "*" or a list of access point Ids')
+    room_names = []
+    for ap_id in ap_ids:
+        if isinstance(ap_id, str) and ap_id.strip().isdigit():
+            ap_id = int(ap_id)
+        if isinstance(ap_id, bool) or not isinstance(ap_id, int):
+            raise ValueError(f"Invalid access point Id: {ap_id!r}")
+        room_names.append(access_point_room(ap_id))
+    return room_names
+
+
+@socketio.on("subscribe")
+def handle_subscribe(data):
+    """
+    Replace the client's live feed subscription.
+
+    ``{"ap_ids": [1, 2]}`` limits ``new_events`` to those access points;
+    ``{"ap_ids": "*"}`` (the default) restores the full feed. Invalid input
+    is answered with ``subscribe_error`` and the current subscription kept.
+    """
+    try:
+        new_rooms = parse_subscription(data)
+    except ValueError as exc:
+        emit("subscribe_error", {"error": str(exc)})
+        return
+    for room in rooms():
+        if room.startswith("ap:"):
+            leave_room(room)
+    for room in new_rooms:
+        join_room(room)
+    logger.debug("Client %s subscribed to %s", request.sid, new_rooms)
 
 
 @socketio.on("disconnect")
@@ -504,6 +1228,7 @@ def handle_disconnect():
 # ---------------------------------------------------------------------------
 
 if __name__ == "__main__":
+    _init_soap()
     socketio.start_background_task(poll_new_events)
     socketio.run(
         app,
@@ -12,9 +12,23 @@
 
 const socket = io();
 
+// Optional ?ap=1,2 restricts the live feed to those access point Ids
+const apFilter = new URLSearchParams(window.location.search).get("ap");
+const filterIds = apFilter
+    ? apFilter.split(",").filter((s) => s.trim() !== "").map(Number).filter(Number.isInteger)
+    : [];
+const subscribedAPs = filterIds.length ? filterIds : "*";
+
+function forSubscribedAPs(events) {
+    return subscribedAPs === "*"
+        ? events
+        : events.filter((evt) => subscribedAPs.includes(evt.AccesspointId));
+}
+
 socket.on("connect", () => {
     document.getElementById("ws-status").classList.replace("offline", "online");
     document.getElementById("ws-label").textContent = "Live";
+    socket.emit("subscribe", { ap_ids: subscribedAPs });
 });
 
 socket.on("disconnect", () => {
@@ -22,10 +36,51 @@ socket.on("disconnect", () => {
     document.getElementById("ws-label").textContent = "Déconnecté";
 });
 
-socket.on("new_events", (events) => {
-    prependEvents(events);
+// Filtered too: the server joins ap:* before our subscribe arrives
+socket.on("new_events", (payload) => {
+    prependEvents(forSubscribedAPs(decodePayload(payload)));
 });
 
+socket.on("subscribe_error", (err) => {
+    console.warn("Subscription rejected:", err.error);
+});
+
+// Last events buffered by the server, sent on every (re)connect
+socket.on("recent_events", (payload) => {
+    prependEvents(forSubscribedAPs(decodePayload(payload)));
+});
+
+// Alarm rows arrive with the push: render them instead of refetching /api/alerts
+socket.on("new_alerts", (payload) => {
+    prependAlerts(
+        decodePayload(payload).map((evt) => ({
+            ...evt,
+            AlertDescription: alertDescription(evt.EventTypeName),
+        }))
+    );
+});
+
+/**
+ * Decode a Socket.IO payload the server sent as pre-serialized JSON bytes.
+ * Event batches arrive columnar ({key: [values...]}) and are turned back
+ * into a list of objects.
+ */
+function decodePayload(payload) {
+    let data = payload;
+    if (payload instanceof ArrayBuffer) {
+        data = JSON.parse(new TextDecoder().decode(payload));
+    }
+    return Array.isArray(data) ? data : fromColumns(data);
+}
+
+function fromColumns(columns) {
+    const keys = Object.keys(columns);
+    const count = keys.length ? columns[keys[0]].length : 0;
+    return Array.from({ length: count }, (_, i) =>
+        Object.fromEntries(keys.map((k) => [k, columns[k][i]]))
+    );
+}
+
 // ---------------------------------------------------------------------------
 // REST API helpers
 // ---------------------------------------------------------------------------
@@ -36,6 +91,10 @@ async function fetchJSON(url) {
     return res.json();
 }
 
+function sum(values) {
+    return (values || []).reduce((s, v) => s + v, 0);
+}
+
 function formatTime(iso) {
     if (!iso) return "--";
     const d = new Date(iso);
@@ -60,10 +119,18 @@ function classifyEvent(eventTypeName) {
 // Events table — uses AEOS EventInfo fields
 // ---------------------------------------------------------------------------
 
+// Ids of the rows currently in the table: REST, catch-up and live pushes overlap
+const shownEventIds = new Set();
+
 function prependEvents(events) {
     const tbody = document.getElementById("events-body");
     events.forEach((evt) => {
+        if (evt.Id != null) {
+            if (shownEventIds.has(evt.Id)) return;
+            shownEventIds.add(evt.Id);
+        }
         const tr = document.createElement("tr");
+        if (evt.Id != null) tr.dataset.eventId = evt.Id;
         const { cls, label } = classifyEvent(evt.EventTypeName);
         const name = evt.CarrierFullName || "--";
 
@@ -79,6 +146,7 @@ function prependEvents(events) {
 
     // Keep max 100 rows
     while (tbody.children.length > 100) {
+        shownEventIds.delete(Number(tbody.lastChild.dataset.eventId));
         tbody.removeChild(tbody.lastChild);
     }
 }
@@ -86,7 +154,7 @@ function prependEvents(events) {
 async function loadRecentEvents() {
     try {
         const data = await fetchJSON("/api/events/recent?limit=50&hours=1");
-        prependEvents(data.events.reverse());
+        prependEvents(forSubscribedAPs(data.events.reverse()));
     } catch (e) {
         console.warn("Failed to load events:", e);
     }
@@ -99,13 +167,13 @@ async function loadRecentEvents() {
 async function updateKPIs() {
     try {
         const [evtData, alertData, apData] = await Promise.all([
-            fetchJSON("/api/analytics/hourly"),
+            fetchJSON("/api/analytics/hourly?layout=columns"),
             fetchJSON("/api/alerts?limit=200&hours=24"),
             fetchJSON("/api/accesspoints"),
         ]);
 
-        const totalEvents = evtData.hourly.reduce((s, h) => s + h.EventCount, 0);
-        const totalDenied = evtData.hourly.reduce((s, h) => s + h.Denied, 0);
+        const totalEvents = sum(evtData.hourly.EventCount);
+        const totalDenied = sum(evtData.hourly.Denied);
         const totalAPs = apData.access_points ? apData.access_points.length : 0;
 
         document.getElementById("kpi-events-today").textContent = totalEvents.toLocaleString();
@@ -126,10 +194,10 @@ let topAPChart = null;
 
 async function renderHourlyChart() {
     try {
-        const data = await fetchJSON("/api/analytics/hourly");
-        const labels = data.hourly.map((h) => `${String(h.Hour).padStart(2, "0")}:00`);
-        const granted = data.hourly.map((h) => h.Granted);
-        const denied = data.hourly.map((h) => h.Denied);
+        const data = await fetchJSON("/api/analytics/hourly?layout=columns");
+        const labels = (data.hourly.Hour || []).map((h) => `${String(h).padStart(2, "0")}:00`);
+        const granted = data.hourly.Granted || [];
+        const denied = data.hourly.Denied || [];
 
         const ctx = document.getElementById("hourly-chart").getContext("2d");
         if (hourlyChart) hourlyChart.destroy();
@@ -200,18 +268,27 @@ async function renderTopAPChart() {
 
 async function renderAccessPointGrid() {
     try {
-        const data = await fetchJSON("/api/accesspoints");
+        const [data, statusData] = await Promise.all([
+            fetchJSON("/api/accesspoints"),
+            fetchJSON("/api/doors/status"),
+        ]);
+        const doors = new Map(statusData.doors.map((d) => [d.AccesspointId, d]));
         const grid = document.getElementById("door-grid");
         grid.innerHTML = "";
 
         data.access_points.forEach((ap) => {
+            const door = doors.get(ap.Id);
+            const dot = door && door.Status === "alarm" ? "offline" : "online";
+            const state = door
+                ? `${door.LastEventTypeName} — ${formatTime(door.LastEventTime)}`
+                : `${ap.Type || "Reader"} — ${ap.HostName || ""}`;
             const tile = document.createElement("div");
             tile.className = "door-tile";
             tile.innerHTML = `
-                <span class="dot online"></span>
+                <span class="dot ${dot}"></span>
                 <div>
                     <div class="door-name">${ap.Name}</div>
-                    <div class="door-state">${ap.Type || "Reader"} — ${ap.HostName || ""}</div>
+                    <div class="door-state">${state}</div>
                 </div>
             `;
             grid.appendChild(tile);
@@ -225,23 +302,45 @@ async function renderAccessPointGrid() {
 // Alerts table
 // ---------------------------------------------------------------------------
 
+/**
+ * Mirror of the AlertDescription CASE in SQL_SECURITY_ALERTS.
+ */
+function alertDescription(eventTypeName) {
+    if (eventTypeName === "Tailgating") return "Tailgating détecté";
+    if (eventTypeName === "Door forced open") return "Porte forcée";
+    if (eventTypeName === "Door held open") return "Porte maintenue ouverte";
+    if ((eventTypeName || "").startsWith("Access denied")) return `Accès refusé — ${eventTypeName}`;
+    return eventTypeName;
+}
+
+function alertRow(a) {
+    const tr = document.createElement("tr");
+    tr.innerHTML = `
+        <td>${formatTime(a.DateTime)}</td>
+        <td><span class="badge alert">${a.AlertDescription}</span></td>
+        <td>${a.AccesspointName || "--"}</td>
+        <td>${a.CarrierFullName || "--"}</td>
+        <td>${a.Identifier || "--"}</td>
+    `;
+    return tr;
+}
+
+function prependAlerts(alerts) {
+    const tbody = document.getElementById("alerts-body");
+    alerts.forEach((a) => tbody.insertBefore(alertRow(a), tbody.firstChild));
+
+    // Same size as the /api/alerts?limit=20 page
+    while (tbody.children.length > 20) {
+        tbody.removeChild(tbody.lastChild);
+    }
+}
+
 async function loadAlerts() {
     try {
         const data = await fetchJSON("/api/alerts?limit=20&hours=24");
         const tbody = document.getElementById("alerts-body");
         tbody.innerHTML = "";
-
-        data.alerts.forEach((a) => {
-            const tr = document.createElement("tr");
-            tr.innerHTML = `
-                <td>${formatTime(a.DateTime)}</td>
-                <td><span class="badge alert">${a.AlertDescription}</span></td>
-                <td>${a.AccesspointName || "--"}</td>
-                <td>${a.CarrierFullName || "--"}</td>
-                <td>${a.Identifier || "--"}</td>
-            `;
-            tbody.appendChild(tr);
-        });
+        data.alerts.forEach((a) => tbody.appendChild(alertRow(a)));
     } catch (e) {
         console.warn("Failed to load alerts:", e);
     }